@@ -303,7 +303,7 @@ def set_camera_parameters_from_config_file(camera_intrinsics_file_path: str, rea
 
     with open(camera_intrinsics_file_path, "r", encoding="utf-8") as file:
         final_lines = []
-        for line in file.readlines():
+        for line in file:
             line = line.strip()
             if "#" in line:
                 line = line[:line.find("#")].strip()
@@ -1,5 +1,8 @@
 """Run the physics simulation for the objects in the scene."""
 
+from contextlib import contextmanager
+from typing import Iterator, List
+
 import bpy
 import mathutils
 import numpy as np
@@ -13,12 +16,16 @@ def simulate_physics_and_fix_final_poses(min_simulation_time: float = 4.0, max_s
                                          check_object_interval: float = 2.0,
                                          object_stopped_location_threshold: float = 0.01,
                                          object_stopped_rotation_threshold: float = 0.1, substeps_per_frame: int = 10,
-                                         solver_iters: int = 10, verbose: bool = False):
+                                         solver_iters: int = 10, verbose: bool = False,
+                                         check_object_interval_growth: float = 1.0):
     """ Simulates the current scene and in the end fixes the final poses of all active objects.
 
     The simulation is run for at least `min_simulation_time` seconds and at a maximum `max_simulation_time` seconds.
-    Every `check_object_interval` seconds, it is checked if the maximum object movement in the last second is below a
-    given threshold. If that is the case, the simulation is stopped.
+    Every `check_object_interval` seconds, it is checked if the maximum object movement in the last second is below
+    a given threshold. If that is the case, the simulation is stopped. If `check_object_interval_growth` is bigger
+    than 1, the interval to the next check is multiplied by it whenever the movement decreased by less than 10% since
+    the previous check. Checks can then be much further apart than `check_object_interval`, and the simulation may
+    continue well past the point where all objects have stopped.
 
     After performing the simulation, the simulation cache is removed, the rigid body components are disabled and the
     pose of the active objects is set to their final pose in the simulation.
@@ -36,6 +43,10 @@ def simulate_physics_and_fix_final_poses(min_simulation_time: float = 4.0, max_s
     :param substeps_per_frame: Number of simulation steps taken per frame.
     :param solver_iters: Number of constraint solver iterations made per simulation step.
     :param verbose: If True, more details during the physics simulation are printed.
+    :param check_object_interval_growth: Factor by which the check interval is multiplied whenever the object
+                                         movement decreased by less than 10% since the previous check. The grown
+                                         interval is rounded to a multiple of `check_object_interval`. 1.0 keeps the
+                                         check interval constant.
     """
     # Undo changes made in the simulation like origin adjustment and persisting the object's scale
     with UndoAfterExecution():
@@ -43,7 +54,7 @@ def simulate_physics_and_fix_final_poses(min_simulation_time: float = 4.0, max_s
         obj_poses_before_sim = _PhysicsSimulation.get_pose()
         origin_shifts = simulate_physics(min_simulation_time, max_simulation_time, check_object_interval,
                                          object_stopped_location_threshold, object_stopped_rotation_threshold,
-                                         substeps_per_frame, solver_iters, verbose)
+                                         substeps_per_frame, solver_iters, verbose, check_object_interval_growth)
         obj_poses_after_sim = _PhysicsSimulation.get_pose()
 
         # Make sure to remove the simulation cache as we are only interested in the final poses
@@ -76,12 +87,16 @@ def simulate_physics_and_fix_final_poses(min_simulation_time: float = 4.0, max_s
 def simulate_physics(min_simulation_time: float = 4.0, max_simulation_time: float = 40.0,
                      check_object_interval: float = 2.0, object_stopped_location_threshold: float = 0.01,
                      object_stopped_rotation_threshold: float = 0.1, substeps_per_frame: int = 10,
-                     solver_iters: int = 10, verbose: bool = False) -> dict:
+                     solver_iters: int = 10, verbose: bool = False,
+                     check_object_interval_growth: float = 1.0) -> dict:
     """ Simulates the current scene.
 
     The simulation is run for at least `min_simulation_time` seconds and at a maximum `max_simulation_time` seconds.
     Every `check_object_interval` seconds, it is checked if the maximum object movement in the last second is below
-    a given threshold. If that is the case, the simulation is stopped.
+    a given threshold. If that is the case, the simulation is stopped. If `check_object_interval_growth` is bigger
+    than 1, the interval to the next check is multiplied by it whenever the movement decreased by less than 10% since
+    the previous check. Checks can then be much further apart than `check_object_interval`, and the simulation may
+    continue well past the point where all objects have stopped.
 
     The origin of all objects is set to their center of mass in this function which is necessary to achieve a realistic
     simulation in blender (see https://blender.stackexchange.com/questions/167488/physics-not-working-as-expected)
@@ -100,6 +115,10 @@ def simulate_physics(min_simulation_time: float = 4.0, max_simulation_time: floa
     :param substeps_per_frame: Number of simulation steps taken per frame.
     :param solver_iters: Number of constraint solver iterations made per simulation step.
     :param verbose: If True, more details during the physics simulation are printed.
+    :param check_object_interval_growth: Factor by which the check interval is multiplied whenever the object
+                                         movement decreased by less than 10% since the previous check. The grown
+                                         interval is rounded to a multiple of `check_object_interval`. 1.0 keeps the
+                                         check interval constant.
     :return: A dict containing for every active object the shift that was added to their origins.
     """
     # Shift the origin of all objects to their center of mass to make the simulation more realistic
@@ -117,10 +136,11 @@ def simulate_physics(min_simulation_time: float = 4.0, max_simulation_time: floa
     bpy.context.scene.rigidbody_world.substeps_per_frame = substeps_per_frame
     bpy.context.scene.rigidbody_world.solver_iterations = solver_iters
 
-    # Perform simulation
-    _PhysicsSimulation.do_simulation(min_simulation_time, max_simulation_time, check_object_interval,
-                                     object_stopped_location_threshold, object_stopped_rotation_threshold,
-                                     verbose)
+    # Perform simulation, objects that do not take part in it do not have to be evaluated in every simulated frame
+    with _PhysicsSimulation.hide_objects_not_involved_in_simulation():
+        _PhysicsSimulation.do_simulation(min_simulation_time, max_simulation_time, check_object_interval,
+                                         object_stopped_location_threshold, object_stopped_rotation_threshold,
+                                         verbose, check_object_interval_growth)
 
     return origin_shift
 
@@ -148,11 +168,11 @@ class _PhysicsSimulation:
     @staticmethod
     def do_simulation(min_simulation_time: float, max_simulation_time: float, check_object_interval: float,
                       object_stopped_location_threshold: float, object_stopped_rotation_threshold: float,
-                      verbose: bool = False):
+                      verbose: bool = False, check_object_interval_growth: float = 1.0):
         """ Perform the simulation.
 
-        This method bakes the simulation for the configured number of iterations and returns all object positions
-        at the last frame.
+        This method bakes the simulation in steps until all objects have stopped moving or the maximum simulation
+        time has been reached. Afterwards, the scene is at the last simulated frame.
 
         :param min_simulation_time: The minimum number of seconds to simulate.
         :param max_simulation_time: The maximum number of seconds to simulate.
@@ -165,6 +185,10 @@ class _PhysicsSimulation:
                                                   Euler vector that is allowed such that an object is still recognized
                                                   as 'stopped moving'.
         :param verbose: If True, more details during the physics simulation are printed.
+        :param check_object_interval_growth: Factor by which the check interval is multiplied whenever the object
+                                             movement decreased by less than 10% since the previous check. The grown
+                                             interval is rounded to a multiple of `check_object_interval`. 1.0 keeps
+                                             the check interval constant.
         """
         # Make sure the RigidBody world is active
         bpy.context.scene.rigidbody_world.enabled = True
@@ -176,8 +200,16 @@ class _PhysicsSimulation:
         if min_simulation_time >= max_simulation_time:
             raise Exception("max_simulation_iterations has to be bigger than min_simulation_iterations")
 
-        # Run simulation starting from min to max in the configured steps
-        for current_time in np.arange(min_simulation_time, max_simulation_time, check_object_interval):
+        # Collect the objects whose poses are checked once, so the checks do not have to walk the whole scene
+        active_objects = _PhysicsSimulation.get_active_rigidbody_objects()
+
+        # Run simulation starting from min to max in the configured steps (a growing check interval skips some of them)
+        check_times = np.arange(min_simulation_time, max_simulation_time, check_object_interval)
+        check_index = 0
+        check_interval_factor = 1.0
+        last_movement = None
+        while True:
+            current_time = check_times[check_index]
             current_frame = _PhysicsSimulation.seconds_to_frames(current_time)
             print("Running simulation up to " + str(current_time) + " seconds (" + str(current_frame) + " frames)")
 
@@ -186,13 +218,10 @@ class _PhysicsSimulation:
             with stdout_redirected(enabled=not verbose):
                 bpy.ops.ptcache.bake({"point_cache": point_cache}, bake=True)
 
-            # Go to second last frame and get poses
-            bpy.context.scene.frame_set(current_frame - _PhysicsSimulation.seconds_to_frames(1))
-            old_poses = _PhysicsSimulation.get_pose()
-
-            # Go to last frame of simulation and get poses
-            bpy.context.scene.frame_set(current_frame)
-            new_poses = _PhysicsSimulation.get_pose()
+            # Get poses at the second last and the last frame of the simulation
+            old_poses = _PhysicsSimulation.get_world_matrices_at_frame(
+                current_frame - _PhysicsSimulation.seconds_to_frames(1), active_objects)
+            new_poses = _PhysicsSimulation.get_world_matrices_at_frame(current_frame, active_objects)
 
             # If objects have stopped moving between the last two frames, then stop here
             if _PhysicsSimulation.have_objects_stopped_moving(old_poses, new_poses, object_stopped_location_threshold,
@@ -200,12 +229,82 @@ class _PhysicsSimulation:
                 print("Objects have stopped moving after " + str(current_time) + "  seconds (" + str(
                     current_frame) + " frames)")
                 break
-            if current_time + check_object_interval >= max_simulation_time:
+            if check_index == len(check_times) - 1:
                 print("Stopping simulation as configured max_simulation_time has been reached")
-            else:
-                # Free bake (this will not completely remove the simulation cache, so further simulations can
-                # reuse the already calculated frames)
-                bpy.ops.ptcache.free_bake({"point_cache": point_cache})
+                break
+
+            # If the location movement only decreased slightly since the last check, the objects will not settle
+            # soon, so increase the check interval to reduce the number of bake calls
+            movement = np.max(np.abs(_PhysicsSimulation.get_locations(old_poses)
+                                     - _PhysicsSimulation.get_locations(new_poses)), initial=0.0)
+            if last_movement is not None and movement > 0.9 * last_movement:
+                check_interval_factor *= check_object_interval_growth
+            last_movement = movement
+
+            # Free bake: A cache that is marked as baked is skipped by the bake operator, so without this the next
+            # iteration would not simulate any further frames
+            bpy.ops.ptcache.free_bake({"point_cache": point_cache})
+            check_index = min(check_index + max(1, round(check_interval_factor)), len(check_times) - 1)
+
+    @staticmethod
+    @contextmanager
+    def hide_objects_not_involved_in_simulation() -> Iterator[None]:
+        """ Temporarily hides all objects in the viewport that do not take part in the rigid body simulation.
+
+        Hidden objects are skipped when the simulation is baked and when the frame is changed, so they do not have
+        to be evaluated in every simulated frame. The following objects are considered as taking part in the
+        simulation and stay visible:
+
+        - objects with a rigid body or rigid body constraint component,
+        - force field objects, as effectors are only collected from visible objects,
+        - all objects the above depend on: their parents, the targets of their object constraints, the objects
+          connected by their rigid body constraints and the objects used in their drivers (recursively).
+
+        Objects linked from a library are read-only and therefore never hidden. After the context is left, the
+        objects are made visible again.
+        """
+        open_objects = [obj for obj in bpy.context.scene.objects
+                        if obj.rigid_body is not None or obj.rigid_body_constraint is not None
+                        or (obj.field is not None and obj.field.type != 'NONE')]
+        involved_object_names = set()
+        while open_objects:
+            obj = open_objects.pop()
+            if obj is None or obj.name_full in involved_object_names:
+                continue
+            involved_object_names.add(obj.name_full)
+
+            # Parents influence the world pose of their children, so they have to be evaluated as well
+            open_objects.append(obj.parent)
+            for constraint in obj.constraints:
+                open_objects.append(getattr(constraint, "target", None))
+            if obj.rigid_body_constraint is not None:
+                open_objects.extend([obj.rigid_body_constraint.object1, obj.rigid_body_constraint.object2])
+            if obj.animation_data is not None:
+                for driver in obj.animation_data.drivers:
+                    for variable in driver.driver.variables:
+                        for target in variable.targets:
+                            if isinstance(target.id, bpy.types.Object):
+                                open_objects.append(target.id)
+
+        hidden_objects = [obj for obj in bpy.context.scene.objects
+                          if obj.name_full not in involved_object_names and not obj.hide_viewport
+                          and obj.library is None]
+        for obj in hidden_objects:
+            obj.hide_viewport = True
+        try:
+            yield
+        finally:
+            for obj in hidden_objects:
+                obj.hide_viewport = False
+
+    @staticmethod
+    def get_active_rigidbody_objects() -> List[bpy.types.Object]:
+        """ Returns all mesh objects in the scene with ACTIVE rigid_body type.
+
+        :return: The list of active rigid body objects.
+        """
+        return [obj for obj in get_all_blender_mesh_objects()
+                if obj.rigid_body is not None and obj.rigid_body.type == 'ACTIVE']
 
     @staticmethod
     def get_pose() -> dict:
@@ -214,23 +313,76 @@ class _PhysicsSimulation:
         :return: Dict of form {obj_name:{'location':[x, y, z], 'rotation':[x_rot, y_rot, z_rot]}}.
         """
         objects_poses = {}
-        objects_with_physics = [obj for obj in get_all_blender_mesh_objects() if obj.rigid_body is not None]
-
-        for obj in objects_with_physics:
-            if obj.rigid_body.type == 'ACTIVE':
-                location = bpy.context.scene.objects[obj.name].matrix_world.translation.copy()
-                rotation = mathutils.Vector(bpy.context.scene.objects[obj.name].matrix_world.to_euler())
-                objects_poses.update({obj.name: {'location': location, 'rotation': rotation}})
+        for obj in _PhysicsSimulation.get_active_rigidbody_objects():
+            matrix_world = obj.matrix_world
+            location = matrix_world.translation.copy()
+            rotation = mathutils.Vector(matrix_world.to_euler())
+            objects_poses[obj.name] = {'location': location, 'rotation': rotation}
 
         return objects_poses
 
     @staticmethod
-    def have_objects_stopped_moving(last_poses: dict, new_poses: dict, object_stopped_location_threshold: float,
+    def get_world_matrices_at_frame(frame: int, objects: List[bpy.types.Object]) -> np.ndarray:
+        """ Returns the world matrices of the given objects at the given frame of the baked simulation.
+
+        The point cache contents are not accessible via the python API, so the scene has to be evaluated at the given
+        frame.
+
+        :param frame: The frame at which the poses should be read.
+        :param objects: The objects whose world matrix should be returned.
+        :return: Array of shape (N, 4, 4) containing the world matrix of every given object.
+        """
+        bpy.context.scene.frame_set(frame)
+        # Read every matrix only once, location and rotation are both extracted from this copy
+        return np.array([obj.matrix_world for obj in objects]).reshape(-1, 4, 4)
+
+    @staticmethod
+    def get_locations(matrices: np.ndarray) -> np.ndarray:
+        """ Extracts the translation of the given world matrices.
+
+        :param matrices: Array of shape (N, 4, 4) containing the world matrices.
+        :return: Array of shape (N, 3), where every row is [x, y, z].
+        """
+        return matrices[:, :3, 3]
+
+    @staticmethod
+    def get_rotations(matrices: np.ndarray) -> np.ndarray:
+        """ Extracts the rotation of the given world matrices as XYZ Euler angles.
+
+        This is a batched version of mathutils' Matrix.to_euler(): From the two possible Euler solutions, the one
+        with the smaller sum of absolute angles is chosen.
+
+        :param matrices: Array of shape (N, 4, 4) containing the world matrices.
+        :return: Array of shape (N, 3), where every row is [x_rot, y_rot, z_rot].
+        """
+        # Remove the scale from the rotation part
+        rot = matrices[:, :3, :3] / np.linalg.norm(matrices[:, :3, :3], axis=1, keepdims=True)
+        cy = np.hypot(rot[:, 0, 0], rot[:, 1, 0])
+
+        euler1 = np.stack([np.arctan2(rot[:, 2, 1], rot[:, 2, 2]),
+                           np.arctan2(-rot[:, 2, 0], cy),
+                           np.arctan2(rot[:, 1, 0], rot[:, 0, 0])], axis=-1)
+        euler2 = np.stack([np.arctan2(-rot[:, 2, 1], -rot[:, 2, 2]),
+                           np.arctan2(-rot[:, 2, 0], -cy),
+                           np.arctan2(-rot[:, 1, 0], -rot[:, 0, 0])], axis=-1)
+        eulers = np.where((np.abs(euler1).sum(axis=-1) <= np.abs(euler2).sum(axis=-1))[:, None], euler1, euler2)
+
+        # Handle gimbal lock
+        gimbal_lock = cy <= 16 * np.finfo(np.float32).eps
+        if np.any(gimbal_lock):
+            eulers[gimbal_lock, 0] = np.arctan2(-rot[gimbal_lock, 1, 2], rot[gimbal_lock, 1, 1])
+            eulers[gimbal_lock, 1] = np.arctan2(-rot[gimbal_lock, 2, 0], cy[gimbal_lock])
+            eulers[gimbal_lock, 2] = 0
+        return eulers
+
+    @staticmethod
+    def have_objects_stopped_moving(last_poses: np.ndarray, new_poses: np.ndarray,
+                                    object_stopped_location_threshold: float,
                                     object_stopped_rotation_threshold: float) -> bool:
         """ Check if the difference between the two given poses per object is smaller than the configured threshold.
 
-        :param last_poses: Dict of form {obj_name:{'location':[x, y, z], 'rotation':[x_rot, y_rot, z_rot]}}.
-        :param new_poses: Dict of form {obj_name:{'location':[x, y, z], 'rotation':[x_rot, y_rot, z_rot]}}.
+        :param last_poses: Array of shape (N, 4, 4) with the world matrices of all objects at the earlier frame.
+        :param new_poses: Array of shape (N, 4, 4) with the world matrices of all objects at the later frame.
         :param object_stopped_location_threshold: The maximum difference per second and per coordinate in the rotation
                                                   Euler vector that is allowed such that an object is still recognized
                                                   as 'stopped moving'.
@@ -239,17 +391,11 @@ class _PhysicsSimulation:
                                                   as 'stopped moving'.
         :return: True, if no objects are moving anymore.
         """
-        stopped = True
-        for obj_name in last_poses:
-            # Check location difference
-            location_diff = last_poses[obj_name]['location'] - new_poses[obj_name]['location']
-            stopped = stopped and not any(location_diff[i] > object_stopped_location_threshold for i in range(3))
-
-            # Check rotation difference
-            rotation_diff = last_poses[obj_name]['rotation'] - new_poses[obj_name]['rotation']
-            stopped = stopped and not any(rotation_diff[i] > object_stopped_rotation_threshold for i in range(3))
-
-            if not stopped:
-                break
-
-        return stopped
+        # Check location difference (the absolute value is computed in place to avoid a second temporary)
+        location_diff = _PhysicsSimulation.get_locations(last_poses) - _PhysicsSimulation.get_locations(new_poses)
+        if np.any(np.abs(location_diff, out=location_diff) > object_stopped_location_threshold):
+            return False
+
+        # Check rotation difference, the Euler conversion is only done if no object has moved
+        rotation_diff = _PhysicsSimulation.get_rotations(last_poses) - _PhysicsSimulation.get_rotations(new_poses)
+        return not np.any(np.abs(rotation_diff, out=rotation_diff) > object_stopped_rotation_threshold)
@@ -185,7 +185,7 @@ class MeshObject(Entity):
 
         return self.get_origin()
 
-    def enable_rigidbody(self, active: bool, collision_shape: str = 'CONVEX_HULL', collision_margin: float = 0.001,
+    def enable_rigidbody(self, active: bool, collision_shape: Optional[str] = None, collision_margin: float = 0.001,
                          collision_mesh_source: str = "FINAL", mass: Optional[float] = None, mass_factor: float = 1,
                          friction: float = 0.5, angular_damping: float = 0.1, linear_damping: float = 0.04):
         """ Enables the rigidbody component of the object which makes it participate in physics simulations.
@@ -193,8 +193,11 @@ class MeshObject(Entity):
         :param active: If True, the object actively participates in the simulation and its key frames are ignored.
                        If False, the object still follows its keyframes and only acts as an obstacle, but is not
                        influenced by the simulation.
-        :param collision_shape: Collision shape of object in simulation. Default: 'CONVEX_HULL'. Available: 'BOX',
-                                'SPHERE', 'CAPSULE', 'CYLINDER', 'CONE', 'CONVEX_HULL', 'MESH', 'COMPOUND'.
+        :param collision_shape: Collision shape of object in simulation. If None is given, the custom property
+                                `collision_shape` of the object is used if it exists, otherwise 'CONVEX_HULL'.
+                                Available: 'BOX', 'SPHERE', 'CAPSULE', 'CYLINDER', 'CONE', 'CONVEX_HULL', 'MESH',
+                                'COMPOUND'. Using 'MESH' for active objects makes the simulation considerably slower,
+                                so it should only be used for objects that really require concave collisions.
         :param collision_margin: The margin around objects where collisions are already recognized. Higher values
                                  improve stability, but also make objects hover a bit.
         :param collision_mesh_source: Source of the mesh used to create collision shape. Default: 'FINAL'. Available:
@@ -207,6 +210,12 @@ class MeshObject(Entity):
         :param angular_damping: Amount of angular velocity that is lost over time.
         :param linear_damping: Amount of linear velocity that is lost over time.
         """
+        if collision_shape is None:
+            collision_shape = self.get_cp("collision_shape") if self.has_cp("collision_shape") else "CONVEX_HULL"
+        if active and collision_shape == "MESH":
+            warnings.warn(f"MeshObject {self.get_name()} is an active rigid body with a 'MESH' collision shape, this "
+                          f"makes the simulation very slow. Consider using 'CONVEX_HULL' or a convex decomposition.")
+
         # Enable rigid body component
         bpy.ops.rigidbody.object_add({'object': self.blender_obj})
         # Sett attributes
@@ -663,9 +672,10 @@ def get_all_mesh_objects() -> List[MeshObject]:
 
 def disable_all_rigid_bodies():
     """ Disables the rigidbody element of all objects """
-    for obj in get_all_mesh_objects():
-        if obj.has_rigidbody_enabled():
-            obj.disable_rigidbody()
+    objects_with_rigidbody = [obj for obj in get_all_blender_mesh_objects() if obj.rigid_body is not None]
+    if objects_with_rigidbody:
+        # Remove all rigid bodies with one operator call instead of calling the operator once per object
+        bpy.ops.rigidbody.objects_remove({"selected_objects": objects_with_rigidbody})
 
 
 def create_bvh_tree_multi_objects(mesh_objects: List[MeshObject]) -> mathutils.bvhtree.BVHTree:
@@ -39,7 +39,7 @@ light.setup_as_projector(pattern_img)
 
 # read the camera positions file and convert into homogeneous camera-world transformation
 with open(args.camera, "r") as f:
-    for line in f.readlines():
+    for line in f:
         line = [float(x) for x in line.split()]
         position = bproc.math.change_coordinate_frame_of_point(line[:3], ["X", "-Z", "Y"])
         rotation = bproc.math.change_coordinate_frame_of_point(line[3:6], ["X", "-Z", "Y"])
@@ -1,5 +1,6 @@
 import blenderproc as bproc
 import argparse
+import numpy as np
 from blenderproc.python.types.MeshObjectUtility import MeshObject, create_primitive
 import bpy
 
@@ -48,13 +49,38 @@ light.set_energy(5000)
 bproc.camera.set_resolution(512, 512)
 bproc.camera.make_ortho_camera()
 
+
+def build_transformation_mats(positions: np.ndarray, euler_rotations: np.ndarray) -> np.ndarray:
+    """
+    Vectorized bproc.math.build_transformation_mat for N poses at once.
+    Euler angles are in blender's default XYZ order, i.e. R = Rz @ Ry @ Rx.
+
+    :param positions: (N, 3) camera locations
+    :param euler_rotations: (N, 3) camera rotations as XYZ euler angles
+    :return: (N, 4, 4) camera-world transformation matrices
+    """
+    n = positions.shape[0]
+    cos, sin = np.cos(euler_rotations), np.sin(euler_rotations)
+    ones, zeros = np.ones(n), np.zeros(n)
+    rx = np.stack([ones, zeros, zeros,
+                   zeros, cos[:, 0], -sin[:, 0],
+                   zeros, sin[:, 0], cos[:, 0]], axis=-1).reshape(n, 3, 3)
+    ry = np.stack([cos[:, 1], zeros, sin[:, 1],
+                   zeros, ones, zeros,
+                   -sin[:, 1], zeros, cos[:, 1]], axis=-1).reshape(n, 3, 3)
+    rz = np.stack([cos[:, 2], -sin[:, 2], zeros,
+                   sin[:, 2], cos[:, 2], zeros,
+                   zeros, zeros, ones], axis=-1).reshape(n, 3, 3)
+    mats = np.tile(np.eye(4), (n, 1, 1))
+    mats[:, :3, :3] = np.einsum("nij,njk,nkl->nil", rz, ry, rx)
+    mats[:, :3, 3] = positions
+    return mats
+
+
 # read the camera positions file and convert into homogeneous camera-world transformation
-with open(args.camera, "r") as f:
-    for line in f.readlines():
-        line = [float(x) for x in line.split()]
-        position, euler_rotation = line[:3], line[3:6]
-        matrix_world = bproc.math.build_transformation_mat(position, euler_rotation)
-        bproc.camera.add_camera_pose(matrix_world)
+poses = np.loadtxt(args.camera, ndmin=2)
+for matrix_world in build_transformation_mats(poses[:, :3], poses[:, 3:6]):
+    bproc.camera.add_camera_pose(matrix_world)
 
 # render the whole pipeline
 data = bproc.renderer.render()
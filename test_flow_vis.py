@@ -9,34 +9,44 @@ def save_img_channels(
         save_as="renders/test.png",
         suptitle: str = None,
 ):
-    plt.figure(figsize=(12, 4))
     n_channels = x.shape[-1]
-    for i in range(x.shape[2]):
-        plt.subplot(1, n_channels, i + 1)
-        plt.imshow(x[..., i], cmap='coolwarm', interpolation="nearest")
-        plt.colorbar()
-        plt.title(f"[..., {i}]")
+    fig, axes = plt.subplots(1, n_channels, figsize=(12, 4), squeeze=False)
+    # share one normalization (and one colorbar) across all channels, centered at zero for the diverging colormap
+    vmax = np.abs(x).max()
+    vmin = -vmax
+    for i, ax in enumerate(axes[0]):
+        im = ax.imshow(x[..., i], cmap='coolwarm', interpolation="nearest", vmin=vmin, vmax=vmax)
+        ax.set_title(f"[..., {i}]")
+    fig.colorbar(im, ax=axes.ravel().tolist())
     if suptitle is not None:
-        plt.suptitle(suptitle)
-    plt.savefig(save_as, bbox_inches='tight', dpi=200)
-    plt.close()
+        fig.suptitle(suptitle)
+    fig.savefig(save_as, bbox_inches='tight', dpi=200)
+    plt.close(fig)
 
 
-with h5py.File("examples/advanced/optical_flow/output/1.hdf5") as f:
+def read_dataset(f, key):
+    # decode the hdf5 dataset straight into the final array instead of going through np.array(...)
+    ds = f[key]
+    out = np.empty(ds.shape, ds.dtype)
+    ds.read_direct(out)
+    return out
+
+
+with h5py.File("examples/advanced/optical_flow/output/1.hdf5", "r", rdcc_nbytes=16 << 20) as f:
     print(f.keys())
-    im1 = np.array(f["colors"])
+    im1 = read_dataset(f, "colors")
     print(im1.shape)
-    ff = np.array(f["forward_flow"])
+    ff = read_dataset(f, "forward_flow")
     print(ff.shape)
     save_img_channels(ff, "forward_flow.png")
 
-with h5py.File("examples/advanced/optical_flow/output/0.hdf5") as f:
+with h5py.File("examples/advanced/optical_flow/output/0.hdf5", "r", rdcc_nbytes=16 << 20) as f:
     print(f.keys())
-    im2 = np.array(f["colors"])
+    im2 = read_dataset(f, "colors")
     print(im2.shape)
-    fb = np.array(f["backward_flow"])
+    fb = read_dataset(f, "backward_flow")
     print(fb.shape)
-    save_img_channels(ff, "backward_flow.png")
+    save_img_channels(fb, "backward_flow.png")
 
 plt.figure()
 plt.imshow(im1)
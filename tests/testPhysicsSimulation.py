@@ -0,0 +1,73 @@
+import blenderproc as bproc
+
+import unittest
+import numpy as np
+from mathutils import Euler, Matrix, Vector
+
+from blenderproc.python.object.PhysicsSimulation import _PhysicsSimulation
+
+
+class UnitTestCheckPhysicsSimulation(unittest.TestCase):
+
+    def _assert_rotations_match_to_euler(self, matrices):
+        """ Checks that the batched Euler extraction returns the same angles as mathutils' Matrix.to_euler().
+        """
+        rotations = _PhysicsSimulation.get_rotations(np.array(matrices))
+        for matrix, rotation in zip(matrices, rotations):
+            for x, y in zip(matrix.to_euler(), rotation):
+                self.assertAlmostEqual(x, y, places=4)
+
+    def test_get_rotations_random_scaled_matrices(self):
+        """ Tests if the Euler angles of random scaled rotation matrices match the ones of Matrix.to_euler()
+        """
+        np.random.seed(0)
+        matrices = []
+        for _ in range(200):
+            rotation = Euler(np.random.uniform(-3, 3, 3)).to_matrix().to_4x4()
+            scale = Matrix.Diagonal(Vector(np.random.uniform(0.5, 2, 3).tolist() + [1]))
+            translation = Matrix.Translation(np.random.uniform(-10, 10, 3))
+            matrices.append(translation @ rotation @ scale)
+
+        self._assert_rotations_match_to_euler(matrices)
+
+    def test_get_rotations_gimbal_lock(self):
+        """ Tests if the Euler angles in gimbal lock (y rotation of +-90 degrees) match the ones of Matrix.to_euler()
+        """
+        matrices = []
+        for y_rot in [np.pi / 2, -np.pi / 2]:
+            for x_rot, z_rot in [(0, 0), (0.3, 0.2), (-1.2, 2.5), (2.9, -0.7)]:
+                matrices.append(Euler((x_rot, y_rot, z_rot)).to_matrix().to_4x4())
+
+        self._assert_rotations_match_to_euler(matrices)
+
+    def test_hide_objects_not_involved_in_simulation(self):
+        """ Tests if only objects that do not take part in the simulation are hidden and that they are restored
+        """
+        bproc.clean_up(True)
+        active_obj = bproc.object.create_primitive("CUBE")
+        active_obj.enable_rigidbody(True)
+        passive_obj = bproc.object.create_primitive("PLANE")
+        passive_obj.enable_rigidbody(False)
+        unrelated_obj = bproc.object.create_primitive("SPHERE")
+        force_field = bproc.object.create_empty("force_field")
+        force_field.blender_obj.field.type = 'FORCE'
+        parent = bproc.object.create_empty("parent")
+        active_obj.set_parent(parent)
+
+        objs = [active_obj, passive_obj, unrelated_obj, force_field, parent]
+        with _PhysicsSimulation.hide_objects_not_involved_in_simulation():
+            for obj in objs:
+                self.assertEqual(obj.blender_obj.hide_viewport, obj == unrelated_obj, obj.get_name())
+        for obj in objs:
+            self.assertFalse(obj.blender_obj.hide_viewport, obj.get_name())
+
+        # The visibility also has to be restored if the simulation raises
+        with self.assertRaises(RuntimeError):
+            with _PhysicsSimulation.hide_objects_not_involved_in_simulation():
+                raise RuntimeError("Simulation failed")
+        for obj in objs:
+            self.assertFalse(obj.blender_obj.hide_viewport, obj.get_name())
+
+
+if __name__ == '__main__':
+    unittest.main()